@@ -242,4 +242,313 @@ def restore_documents(originals, backups):
 # Example usage
 originals = ["doc1", "123", "doc2"]
 backups = ["doc2", "doc3", "456"]
-print(restore_documents(originals, backups))  # Output: {'DOC1', 'DOC2', 'DOC3'}
\ No newline at end of file
+print(restore_documents(originals, backups))  # Output: {'DOC1', 'DOC2', 'DOC3'}
+
+# =========================================================
+# 17. Streaming Document Transforms
+# =========================================================
+
+# 17.1 Lazy Line Transforms
+import io
+
+def iter_lines(file, buffer_size=65536):
+    """Yields the lines of a file object read through a fixed-size buffer, like document.split("\\n")."""
+    pieces = []  # Parts of a line spanning several chunks, joined once it ends
+    while chunk := file.read(buffer_size):
+        lines = chunk.split("\n")
+        if len(lines) == 1:
+            pieces.append(chunk)
+            continue
+        pieces.append(lines[0])
+        lines[0] = "".join(pieces)
+        pieces = [lines.pop()]  # The last piece may continue in the next chunk
+        yield from lines
+    yield "".join(pieces)
+
+def change_bullet_style_stream(lines):
+    """Lazily converts bullet points from '-' to '*' in an iterable of lines."""
+    return map(lambda line: "*" + line[1:] if line.startswith("-") else line, lines)
+
+def remove_invalid_lines_stream(lines):
+    """Lazily drops lines starting with '-' from an iterable of lines."""
+    return filter(lambda line: not line.startswith("-"), lines)
+
+# 17.2 Streaming Pipeline
+def stream_document(source, destination, *transforms, buffer_size=65536):
+    """Pipes a file object through line transforms, writing each line as soon as it is ready."""
+    lines = iter_lines(source, buffer_size)
+    for transform in transforms:
+        lines = transform(lines)
+    for index, line in enumerate(lines):
+        if index:
+            destination.write("\n")
+        destination.write(line)
+
+# Example usage
+source = io.StringIO("- Item 1\n- Item 2\nNot a bullet")
+destination = io.StringIO()
+stream_document(source, destination, change_bullet_style_stream, buffer_size=4)
+print(destination.getvalue() == change_bullet_style("- Item 1\n- Item 2\nNot a bullet"))  # Output: True
+
+source = io.StringIO("- Invalid line\nValid line\n- Another invalid line")
+destination = io.StringIO()
+stream_document(source, destination, remove_invalid_lines_stream)
+print(destination.getvalue())  # Output: Valid line
+
+
+# =========================================================
+# 18. Linear-Time `join_first_sentences`
+# =========================================================
+
+# 18.1 String Reduce Helper
+import time
+from itertools import islice
+
+def string_reduce(pieces, separator="", n=None):
+    """Joins the first 'n' pieces (all if n is None) of any iterable into one string in linear time."""
+    return separator.join(islice(pieces, n))
+
+def join_first_sentences_linear(sentences, n):
+    """Joins the first 'n' sentences from any iterable without copying the text at every step."""
+    return string_reduce(iter(sentences), ". ", n) + "." if n > 0 else ""
+
+# Example usage
+sentences = ["This is sentence 1", "This is sentence 2", "This is sentence 3"]
+print(join_first_sentences_linear(sentences, 2))  # Output: This is sentence 1. This is sentence 2.
+print(join_first_sentences_linear((s for s in sentences), 5))  # Output: This is sentence 1. This is sentence 2. This is sentence 3.
+
+# 18.2 Benchmark
+def benchmark_join(sizes):
+    """Times the reduce-based and linear versions (reduce is quadratic: ~30s at n=100,000)."""
+    for n in sizes:
+        sentences = [f"This is sentence {i}" for i in range(n)]
+        start = time.perf_counter()
+        linear = join_first_sentences_linear(sentences, n)
+        linear_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        assert join_first_sentences(sentences, n) == linear
+        reduce_seconds = time.perf_counter() - start
+        print(f"n={n:>7,}: reduce {reduce_seconds:.3f}s, linear {linear_seconds:.4f}s")
+
+if __name__ == "__main__":  # Keep benchmarks out of spawned pool workers (see 21)
+    benchmark_join([5_000, 10_000, 20_000])
+
+    sentences = [f"This is sentence {i}" for i in range(200_000)]
+    start = time.perf_counter()
+    join_first_sentences_linear(sentences, 200_000)
+    print(f"n=200,000: linear {time.perf_counter() - start:.4f}s")
+
+
+# =========================================================
+# 19. Compiled Lookup Tables for `file_type_getter`
+# =========================================================
+
+# 19.1 Compiled, Read-Only Type Tables
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
+@lru_cache(maxsize=64)
+def compile_type_table(types):
+    """Builds a read-only extension table once per distinct 'types' tuple, with common spellings precomputed."""
+    types = [(sys.intern(file_type), extensions) for file_type, extensions in types]
+    mapping = {ext: file_type for file_type, extensions in types for ext in extensions}
+    # Spellings are added afterwards so they never shadow an extension given exactly
+    for file_type, extensions in types:
+        for ext in extensions:
+            name = ext.lstrip(".").lower()
+            for variant in (name, name.upper(), "." + name, "." + name.upper()):
+                mapping.setdefault(variant, file_type)
+    return MappingProxyType(mapping)
+
+def file_type_table(types):
+    """Returns the cached table for 'types', accepting lists as well as tuples."""
+    return compile_type_table(tuple((file_type, tuple(extensions)) for file_type, extensions in types))
+
+def lookup_type(table, ext):
+    """Looks up an extension, normalising only unusual spellings such as 'Jpg' that missed the table."""
+    file_type = table.get(ext)
+    if file_type is None:
+        if not isinstance(ext, str):  # e.g. None in an array of extensions
+            return "Unknown"
+        file_type = table.get(ext.lstrip(".").lower(), "Unknown")
+    return file_type
+
+def file_type_getter_compiled(types):
+    """Like file_type_getter, but the table is built once and shared by every getter for the same types."""
+    table = file_type_table(types)
+    return lambda ext: lookup_type(table, ext)
+
+def classify(types, extensions):
+    """Maps a whole list of extensions to file types in one call."""
+    table = file_type_table(types)
+    get = table.get
+    return [get(ext) or lookup_type(table, ext) for ext in extensions]
+
+# Example usage
+types = [("Image", ["jpg", "png"]), ("Document", ["pdf", "doc"])]
+get_type = file_type_getter_compiled(types)
+print(get_type(".JPG"))  # Output: Image
+print(classify(types, ["pdf", "PNG", "Jpg", "txt"]))  # Output: ['Document', 'Image', 'Image', 'Unknown']
+print(file_type_table(types) is file_type_table(types))  # Output: True
+
+
+# =========================================================
+# 20. Set-Based `pair_document_with_format`
+# =========================================================
+
+# 20.1 Cached Format Sets
+from itertools import compress, count
+
+@lru_cache(maxsize=64)
+def cached_format_set(formats):
+    """Builds the frozenset for a tuple of formats once."""
+    return frozenset(formats)
+
+def format_set(formats):
+    """Returns a frozenset of the formats, reused across calls with the same formats."""
+    if isinstance(formats, frozenset):
+        return formats
+    return cached_format_set(tuple(formats))
+
+# 20.2 Pairing Modes
+def pair_document_with_format_fast(doc_names, doc_formats, valid_formats, lazy=False):
+    """Pairs documents with valid formats using O(1) set lookups; lazy=True returns an iterator."""
+    valid = format_set(valid_formats)
+    pairs = filter(lambda pair: pair[1] in valid, zip(doc_names, doc_formats))
+    return pairs if lazy else list(pairs)
+
+def valid_format_indices(doc_formats, valid_formats):
+    """Columnar mode: returns the indices of rows with a valid format instead of building pairs."""
+    valid = format_set(valid_formats)
+    return list(compress(count(), map(valid.__contains__, doc_formats)))
+
+# Example usage
+doc_names = ["doc1", "doc2", "doc3"]
+doc_formats = ["pdf", "doc", "jpg"]
+valid_formats = ["pdf", "jpg"]
+print(pair_document_with_format_fast(doc_names, doc_formats, valid_formats))  # Output: [('doc1', 'pdf'), ('doc3', 'jpg')]
+print(next(pair_document_with_format_fast(doc_names, doc_formats, valid_formats, lazy=True)))  # Output: ('doc1', 'pdf')
+print(valid_format_indices(doc_formats, valid_formats))  # Output: [0, 2]
+
+
+# =========================================================
+# 21. Parallel Bulk `restore_documents`
+# =========================================================
+
+# 21.1 Chunked Restore
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain
+
+def restore_chunk(names):
+    """Restores one chunk of names: drops numeric names and uppercases the rest into a set."""
+    return set(map(str.upper, filter(lambda doc: not doc.isdigit(), names)))
+
+def iter_chunks(iterable, size):
+    """Yields lists of up to 'size' items from any iterable."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def restore_documents_parallel(originals, backups, chunk_size=200_000, workers=None, threshold=2_000_000):
+    """Restores documents from both sources without concatenating them, using a process pool for large inputs."""
+    names = chain(originals, backups)
+    try:
+        small = len(originals) + len(backups) < threshold
+    except TypeError:  # Sources without a length (e.g. generators) are assumed to be large
+        small = False
+    if small:
+        return restore_chunk(names)
+
+    workers = workers or os.cpu_count()
+    restored = set()
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        for chunk in iter_chunks(names, chunk_size):
+            if len(pending) >= 2 * workers:  # Bound the number of chunks held in memory
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    restored |= future.result()
+            pending.add(pool.submit(restore_chunk, chunk))
+        for future in pending:
+            restored |= future.result()
+    return restored
+
+# 21.2 Benchmark
+def benchmark_restore(sizes, workers=None):
+    """Times the serial and process-pool paths to find where the pool starts to pay off."""
+    for size in sizes:
+        originals = [f"doc{i}" if i % 10 else str(i) for i in range(size)]
+        backups = [f"doc{i}" for i in range(0, size, 2)]
+        start = time.perf_counter()
+        serial = restore_documents(originals, backups)
+        serial_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        assert restore_documents_parallel(originals, backups, workers=workers, threshold=0) == serial
+        parallel_seconds = time.perf_counter() - start
+        print(f"{size:>9,} names: serial {serial_seconds:.3f}s, process pool {parallel_seconds:.3f}s")
+
+# Example usage
+originals = ["doc1", "123", "doc2"]
+backups = ["doc2", "doc3", "456"]
+print(restore_documents_parallel(originals, backups) == {"DOC1", "DOC2", "DOC3"})  # Output: True
+
+if __name__ == "__main__":  # Process pools need the main-module guard
+    benchmark_restore([10_000, 100_000, 1_000_000])
+
+
+# =========================================================
+# 22. Multi-Way `get_common_formats`
+# =========================================================
+
+# 22.1 Hash-Based N-Way Intersection
+def probe_formats(candidates, source):
+    """Returns the candidates found in source, stopping early once every candidate has been seen."""
+    found = set()
+    for item in source:
+        if item in candidates:
+            found.add(item)
+            if len(found) == len(candidates):
+                break
+    return found
+
+def common_formats(*sources):
+    """Intersects any number of format lists; only the smallest sized one is turned into a set."""
+    if not sources:
+        return set()
+    sized = [source for source in sources if hasattr(source, "__len__")]
+    base = min(sized, key=len) if sized else sources[0]
+    common = format_set(base) if sized else set(base)  # Reused for repeated reference lists
+    for source in sources:
+        if source is not base and common:
+            common = probe_formats(common, source)  # Generators and files are read lazily
+    return set(common)
+
+# 22.2 Sorted-Merge Intersection
+def sorted_common_formats(*sorted_sources):
+    """Intersects pre-sorted iterables by merging them, without hashing; returns a sorted list."""
+    iterators = [iter(source) for source in sorted_sources]
+    result = []
+    if not iterators:
+        return result
+    try:
+        values = [next(iterator) for iterator in iterators]
+        while True:
+            high = max(values)
+            for i, iterator in enumerate(iterators):
+                while values[i] < high:
+                    values[i] = next(iterator)
+            if all(value == high for value in values):
+                if not result or result[-1] != high:
+                    result.append(high)
+                values = [next(iterator) for iterator in iterators]
+    except StopIteration:  # One input is exhausted, so nothing else can be common
+        return result
+
+# Example usage
+formats1 = ["jpg", "png", "pdf"]
+formats2 = ["pdf", "doc", "jpg"]
+formats3 = (line.strip() for line in io.StringIO("txt\njpg\npdf\n"))  # e.g. an open file of formats
+print(sorted(common_formats(formats1, formats2, formats3)))  # Output: ['jpg', 'pdf']
+print(sorted_common_formats(sorted(formats1), sorted(formats2)))  # Output: ['jpg', 'pdf']
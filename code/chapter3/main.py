@@ -136,4 +136,355 @@ def find_keywords(document):
 # Input
 document = "Functional programming is declarative and immutable."
 # Output
-print(find_keywords(document))  # Output: ['functional', 'immutable', 'declarative']
\ No newline at end of file
+print(find_keywords(document))  # Output: ['functional', 'immutable', 'declarative']
+
+# 10. Persistent Memoization
+# Example: Caching Word Count in a Persistent Hash Map (HAMT)
+from collections import namedtuple
+
+# A map is a tree of ("node", bitmap, children) tuples. Each child is another
+# node, a ("leaf", key_hash, key, value) entry, or a ("bucket", key_hash, pairs)
+# entry for keys whose full hashes collide. 5 hash bits pick the child at each
+# level. Setting a key copies only the nodes on one path (O(log n)); the rest is
+# shared, so the old map is never modified.
+EMPTY_NODE = ("node", 0, ())
+HASH_MASK = 2**64 - 1
+MISSING = object()
+
+def hamt_get(node, key, default=None):
+    key_hash = hash(key) & HASH_MASK
+    shift = 0
+    while node[0] == "node":
+        _, bitmap, children = node
+        bit = 1 << ((key_hash >> shift) & 31)
+        if not bitmap & bit:
+            return default
+        node = children[(bitmap & (bit - 1)).bit_count()]
+        shift += 5
+    if node[0] == "leaf":
+        return node[3] if node[1] == key_hash and node[2] == key else default
+    for bucket_key, value in node[2]:
+        if bucket_key == key:
+            return value
+    return default
+
+def hamt_set(node, key, value, key_hash=None, shift=0):
+    # Returns the new node and whether the key was added (rather than replaced)
+    if key_hash is None:
+        key_hash = hash(key) & HASH_MASK
+    _, bitmap, children = node
+    bit = 1 << ((key_hash >> shift) & 31)
+    index = (bitmap & (bit - 1)).bit_count()
+    if not bitmap & bit:
+        leaf = ("leaf", key_hash, key, value)
+        return ("node", bitmap | bit, children[:index] + (leaf,) + children[index:]), True
+
+    child = children[index]
+    if child[0] == "node":
+        new_child, added = hamt_set(child, key, value, key_hash, shift + 5)
+    elif child[1] != key_hash:
+        # Different keys share this slot: push the existing entry one level down
+        pushed = ("node", 1 << ((child[1] >> (shift + 5)) & 31), (child,))
+        new_child, added = hamt_set(pushed, key, value, key_hash, shift + 5)
+    elif child[0] == "leaf" and child[2] == key:
+        new_child, added = ("leaf", key_hash, key, value), False
+    elif child[0] == "leaf":
+        new_child, added = ("bucket", key_hash, ((child[2], child[3]), (key, value))), True
+    else:
+        pairs = tuple(pair for pair in child[2] if pair[0] != key)
+        new_child, added = ("bucket", key_hash, pairs + ((key, value),)), len(pairs) == len(child[2])
+    return ("node", bitmap, children[:index] + (new_child,) + children[index + 1:]), added
+
+# The memo is an immutable record: two map generations plus counters.
+# New results go into the young generation. Once it holds half the capacity
+# it becomes the old generation and the previous old one is dropped, so
+# eviction costs O(1) and approximates LRU: entries hit in the old generation
+# are promoted back into the young one.
+MemoCache = namedtuple(
+    "MemoCache", ["young", "old", "young_size", "old_size", "capacity", "hits", "misses", "evictions"]
+)
+
+def new_memo_cache(capacity=None):
+    return MemoCache(EMPTY_NODE, EMPTY_NODE, 0, 0, capacity, 0, 0, 0)
+
+def memo_put(cache, key, value):
+    young, added = hamt_set(cache.young, key, value)
+    cache = cache._replace(young=young, young_size=cache.young_size + added)
+    if cache.capacity and cache.young_size >= max(cache.capacity // 2, 1):
+        cache = cache._replace(
+            young=EMPTY_NODE,
+            old=cache.young,
+            young_size=0,
+            old_size=cache.young_size,
+            evictions=cache.evictions + cache.old_size,
+        )
+    return cache
+
+def memo_get(cache, key):
+    value = hamt_get(cache.young, key, MISSING)
+    if value is not MISSING:
+        return value, cache._replace(hits=cache.hits + 1)
+    value = hamt_get(cache.old, key, MISSING)
+    if value is not MISSING:
+        cache = cache._replace(hits=cache.hits + 1, old_size=cache.old_size - 1)
+        return value, memo_put(cache, key, value)
+    return MISSING, cache._replace(misses=cache.misses + 1)
+
+def word_count_memo_persistent(document, cache):
+    count, cache = memo_get(cache, document)
+    if count is MISSING:
+        count = len(document.split())  # Compute word count
+        cache = memo_put(cache, document, count)
+    return count, cache
+
+def memo_stats(cache):
+    lookups = cache.hits + cache.misses
+    return {
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "evictions": cache.evictions,
+        "size": cache.young_size + cache.old_size,
+        "hit_ratio": cache.hits / lookups if lookups else 0.0,
+    }
+
+# Input
+documents = ["a b c", "d e", "a b c", "f", "g h", "a b c"]
+cache = new_memo_cache(capacity=4)
+# Output
+for document in documents:
+    word_count, cache = word_count_memo_persistent(document, cache)
+print(word_count)         # Output: 3
+print(memo_stats(cache))  # Output: {'hits': 2, 'misses': 4, 'evictions': 2, 'size': 2, 'hit_ratio': 0.3333333333333333}
+
+
+# 11. Content-Addressed Memoization
+# Example: Caching Word Count by Document Digest
+import hashlib
+import os
+import sqlite3
+import tempfile
+
+# The cache is keyed on a 16-byte digest, so it never holds document bodies.
+# With verify=True a second, independent digest is stored next to the count
+# and checked on every hit to rule out digest collisions. New counts are kept
+# in `pending` and written to sqlite in one transaction every `batch_size`
+# rows; flush_count_store() writes the rest and close_count_store() calls it.
+CountStore = namedtuple("CountStore", ["connection", "pending", "batch_size"])
+
+def open_count_store(path, batch_size=1_000):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS word_counts (digest BLOB PRIMARY KEY, count INTEGER, checksum BLOB)"
+    )
+    return CountStore(connection, {}, batch_size)
+
+def flush_count_store(store):
+    if store.pending:
+        with store.connection:
+            store.connection.executemany(
+                "INSERT OR REPLACE INTO word_counts VALUES (?, ?, ?)", store.pending.values()
+            )
+        store.pending.clear()
+
+def close_count_store(store):
+    flush_count_store(store)
+    store.connection.close()
+
+def word_count_by_digest(document, cache, store=None, verify=False):
+    data = document.encode()
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    checksum = hashlib.sha256(data).digest() if verify else None
+
+    entry, cache = memo_get(cache, digest)
+    if entry is MISSING and store is not None:
+        row = store.pending.get(digest) or store.connection.execute(
+            "SELECT digest, count, checksum FROM word_counts WHERE digest = ?", (digest,)
+        ).fetchone()
+        if row is not None:
+            entry = tuple(row[1:])
+            cache = memo_put(cache, digest, entry)
+    if entry is not MISSING and not (verify and entry[1] != checksum):
+        return entry[0], cache
+
+    entry = (len(document.split()), checksum)  # Compute word count
+    if store is not None:
+        store.pending[digest] = (digest, *entry)
+        if len(store.pending) >= store.batch_size:
+            flush_count_store(store)
+    return entry[0], memo_put(cache, digest, entry)
+
+if __name__ == "__main__":  # Keep the on-disk example out of spawned scan_many workers (see 13)
+    # Input
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "word_counts.sqlite3")
+        store = open_count_store(path)
+        word_count, cache = word_count_by_digest("This is a sample document.", new_memo_cache(), store, verify=True)
+        close_count_store(store)
+        # A restarted worker starts with an empty cache but reuses the store
+        store = open_count_store(path)
+        word_count, cache = word_count_by_digest("This is a sample document.", new_memo_cache(), store, verify=True)
+        close_count_store(store)
+    # Output
+    print(word_count)         # Output: 5
+    print(memo_stats(cache))  # Output: {'hits': 0, 'misses': 1, 'evictions': 0, 'size': 1, 'hit_ratio': 0.0}
+
+
+# 12. Fast Date Sorting
+# Example: Sorting Dates by Packed Integer Keys
+import random
+import re
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it the integer keys go through sorted()
+    np = None
+
+# One valid "MM-DD-YYYY" date, and every valid date followed by "\n", so one
+# regex pass over the joined column checks the format and the month/day ranges
+# of all dates at C speed
+DATE = re.compile(r"(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])-\d{4}", re.ASCII)
+DATE_COLUMN = re.compile(rf"(?:{DATE.pattern}\n)*", re.ASCII)
+
+def validate_dates(dates):
+    column = "\n".join(dates) + "\n"
+    # Valid dates are exactly 10 characters, which also rules out embedded newlines
+    if len(column) == 11 * len(dates) and DATE_COLUMN.fullmatch(column):
+        return
+    for date in dates:  # Slow path, only taken when something is wrong
+        if not DATE.fullmatch(date):
+            raise ValueError(f"Malformed date: {date!r}")
+
+def date_key(date):
+    # "MM-DD-YYYY" -> YYYYMMDD as a single integer
+    return int(date[6:]) * 10000 + int(date[:2]) * 100 + int(date[3:5])
+
+def sort_dates_fast(dates, validate=True):
+    dates = list(dates)
+    if validate:
+        validate_dates(dates)
+    if np is not None:
+        order = np.argsort(np.fromiter(map(date_key, dates), dtype=np.int64, count=len(dates)), kind="stable")
+        return [dates[i] for i in order]
+    return sorted(dates, key=date_key)
+
+# Input
+dates = ["12-31-2022", "01-15-2023", "10-05-2022"]
+# Output
+print(sort_dates_fast(dates))  # Output: ['10-05-2022', '12-31-2022', '01-15-2023']
+try:
+    sort_dates_fast(["12-31-2022", "2023-01-15"])
+except ValueError as error:
+    print(error)  # Output: Malformed date: '2023-01-15'
+
+# Benchmark
+# Note: sort_dates orders by year, then day, then month (its key is the
+# reversed [month, day, year] list); the packed key is chronological.
+if __name__ == "__main__":
+    dates = [f"{month:02}-{day:02}-{year}" for year in range(1900, 2000) for month in range(1, 13) for day in range(1, 29)] * 3
+    random.shuffle(dates)
+    start = time.perf_counter()
+    sort_dates(dates)
+    split_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    sort_dates_fast(dates)
+    packed_seconds = time.perf_counter() - start
+    print(f"{len(dates):,} dates: split keys {split_seconds:.3f}s, packed keys {packed_seconds:.3f}s")
+
+
+# 13. Multi-Keyword Scanning
+# Example: Finding Many Keywords in One Pass (Aho-Corasick)
+from collections import deque, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+# The index is an automaton over the lowercased keywords: goto[state] maps a
+# character to the next state, fail[state] is the state for the longest suffix
+# that is also a keyword prefix, and outputs[state] lists the keywords ending there
+KeywordIndex = namedtuple("KeywordIndex", ["keywords", "goto", "fail", "outputs"])
+
+def build_keyword_index(keywords):
+    keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+    goto, fail, outputs = [{}], [0], [()]
+    for keyword_number, keyword in enumerate(keywords):
+        state = 0
+        for char in keyword:
+            if char not in goto[state]:
+                goto[state][char] = len(goto)
+                goto.append({})
+                fail.append(0)
+                outputs.append(())
+            state = goto[state][char]
+        outputs[state] += (keyword_number,)
+
+    # Breadth-first, so a state's failure link is ready before its children need it
+    pending = deque(goto[0].values())
+    while pending:
+        state = pending.popleft()
+        for char, child in goto[state].items():
+            pending.append(child)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[child] = goto[fallback].get(char, 0)
+            outputs[child] += outputs[fail[child]]
+    return KeywordIndex(keywords, goto, fail, outputs)
+
+# Lowercases the document once and scans it once. mode="found" returns the
+# keywords present (like find_keywords), "counts" returns {keyword: count}, and
+# "positions" returns {keyword: [start offsets in the lowercased document]}
+def scan_keywords(index, document, mode="found"):
+    if mode not in ("found", "counts", "positions"):
+        raise ValueError(f"Unsupported mode: {mode}")
+    keywords, goto, fail, outputs = index
+    matches = defaultdict(list)
+    state = 0
+    for position, char in enumerate(document.lower()):
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        for keyword_number in outputs[state]:
+            matches[keyword_number].append(position - len(keywords[keyword_number]) + 1)
+        if mode == "found" and outputs[state] and len(matches) == len(keywords):
+            break  # Every keyword has been seen
+    if mode == "found":
+        return [keyword for number, keyword in enumerate(keywords) if number in matches]
+    if mode == "counts":
+        return {keywords[number]: len(starts) for number, starts in sorted(matches.items())}
+    return {keywords[number]: starts for number, starts in sorted(matches.items())}
+
+# Scans many documents with a thread pool, or a process pool for CPU-bound
+# batches (processes=True, which needs the main-module guard). Each worker
+# process receives the index once, through the pool initializer, and documents
+# are sent in chunks of several per task
+_worker_index = None
+
+def _set_worker_index(index):
+    global _worker_index
+    _worker_index = index
+
+def _scan_in_worker(document, mode):
+    return scan_keywords(_worker_index, document, mode)
+
+def scan_many(index, documents, mode="found", workers=None, processes=False):
+    if mode not in ("found", "counts", "positions"):
+        raise ValueError(f"Unsupported mode: {mode}")
+    if not processes:
+        with ThreadPoolExecutor(workers) as pool:
+            return list(pool.map(partial(scan_keywords, index, mode=mode), documents))
+    documents = list(documents)
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(documents) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=_set_worker_index, initargs=(index,)) as pool:
+        return list(pool.map(partial(_scan_in_worker, mode=mode), documents, chunksize=chunksize))
+
+# Input
+index = build_keyword_index(["functional", "immutable", "declarative", "pure"])
+document = "Functional programming is declarative and immutable. Functional code is pure."
+# Output
+print(scan_keywords(index, document))  # Output: ['functional', 'immutable', 'declarative', 'pure']
+print(scan_keywords(index, document, mode="counts"))  # Output: {'functional': 2, 'immutable': 1, 'declarative': 1, 'pure': 1}
+print(scan_keywords(index, "Pure and impure", mode="positions"))  # Output: {'pure': [0, 11]}
+print(scan_many(index, ["Immutable data", "Nothing here"]))  # Output: [['immutable'], []]
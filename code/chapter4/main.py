@@ -89,4 +89,325 @@ directory = {
 
 file_paths = list_files(directory)
 print(file_paths)
-# Output: ['/Documents/Proposal.docx', '/Documents/Receipts/January/receipt1.txt', '/Documents/Receipts/January/receipt2.txt', '/Documents/Receipts/February/receipt3.txt']
\ No newline at end of file
+# Output: ['/Documents/Proposal.docx', '/Documents/Receipts/January/receipt1.txt', '/Documents/Receipts/January/receipt2.txt', '/Documents/Receipts/February/receipt3.txt']
+
+# 5. Iterative Zipmap
+import time
+
+def zipmap_iterative(keys, values):
+    """
+    Create a dictionary from any two iterables in O(n), without recursion.
+    Pairs are applied from last to first, exactly like the recursive zipmap
+    unwinds, so the first occurrence of a duplicate key wins and the key
+    order matches the recursive version.
+    """
+    result = {}
+    for key, value in reversed(list(zip(keys, values))):
+        result[key] = value
+    return result
+
+# Example usage
+zipped = zipmap_iterative(iter(["a", "b", "a"]), (value for value in [1, 2, 3]))
+print(zipped)  # Output: {'a': 1, 'b': 2}
+print(zipmap_iterative(["x", "y"], [1, 2]) == zipmap(["x", "y"], [1, 2]))  # Output: True
+
+def benchmark_zipmap(sizes):
+    """Time zipmap_iterative on growing inputs to show linear scaling."""
+    for size in sizes:
+        start = time.perf_counter()
+        zipmap_iterative(range(size), range(size))
+        print(f"{size:>9,} pairs: {time.perf_counter() - start:.3f}s")
+
+# Benchmarks and other heavy examples only run when this file is executed
+# directly, not when process-pool workers re-import it (section 9)
+if __name__ == "__main__":
+    benchmark_zipmap([10_000, 100_000, 1_000_000])
+
+
+# 6. Trampolined Recursion
+import timeit
+
+def trampoline(func):
+    """
+    Run a recursive function on an explicit stack instead of the call stack.
+    The function is written as a generator: a recursive call is spelled
+    `result = yield (args...)`, and the trampoline runs that call and sends
+    its return value back. Depth is limited by memory, not the recursion limit.
+    """
+    def wrapper(*args):
+        stack = [func(*args)]
+        result = None
+        while stack:
+            try:
+                call_args = stack[-1].send(result)
+            except StopIteration as done:  # The call returned
+                stack.pop()
+                result = done.value
+            else:  # The call made a recursive call
+                stack.append(func(*call_args))
+                result = None
+        return result
+    return wrapper
+
+@trampoline
+def factorial_t(x):
+    """Trampolined factorial_r."""
+    if x == 0:  # Base case
+        return 1
+    return x * (yield (x - 1,))  # Recursive case
+
+@trampoline
+def sum_nested_list_t(lst):
+    """Trampolined sum_nested_list."""
+    total = 0
+    for item in lst:
+        if isinstance(item, int):  # Base case
+            total += item
+        elif isinstance(item, list):  # Recursive case
+            total += yield (item,)
+    return total
+
+@trampoline
+def list_files_t(parent_directory, current_filepath=""):
+    """Trampolined list_files."""
+    file_paths = []
+    for key in parent_directory:
+        new_filepath = current_filepath + "/" + key if current_filepath else key
+        if parent_directory[key] == None:  # Base case
+            file_paths.append(new_filepath)
+        else:  # Recursive case
+            file_paths.extend((yield (parent_directory[key], new_filepath)))
+    return file_paths
+
+# Example usage
+print(factorial_t(5))  # Output: 120
+print(list_files_t(directory) == list_files(directory))  # Output: True
+
+if __name__ == "__main__":
+    deep_list = [1]
+    for _ in range(100_000):  # Far past the recursion limit (10**6 also works, given the memory)
+        deep_list = [1, deep_list]
+    print(sum_nested_list_t(deep_list))  # Output: 100001
+
+def benchmark_trampoline(n, number=200):
+    """Compare the per-call cost of direct recursion and the trampoline."""
+    direct = timeit.timeit(lambda: factorial_r(n), number=number) / (number * n)
+    trampolined = timeit.timeit(lambda: factorial_t(n), number=number) / (number * n)
+    print(f"direct: {direct * 1e9:.0f} ns/call, trampolined: {trampolined * 1e9:.0f} ns/call")
+
+if __name__ == "__main__":
+    benchmark_trampoline(500)
+
+
+# 7. Streaming Directory Walker
+import os
+import tempfile
+from collections.abc import Mapping
+
+def iter_files(parent_directory):
+    """
+    Lazily yield file paths in the same order as list_files.
+    An explicit stack of (entries iterator, directory prefix) replaces the
+    recursion, and each directory's prefix is built once and shared by every
+    path below it instead of building and extending a list per subtree.
+    """
+    stack = [(iter_entries(parent_directory), "")]
+    while stack:
+        entries, prefix = stack[-1]
+        for key, value in entries:
+            if value is None:  # File
+                yield prefix + key
+            else:  # Directory: descend, then resume this iterator afterwards
+                stack.append((iter_entries(value), prefix + key + "/"))
+                break
+        else:
+            stack.pop()
+
+def iter_entries(parent_directory):
+    """Iterate (name, value) pairs of a nested dict or a DirectoryTree."""
+    if isinstance(parent_directory, DirectoryTree):
+        return iter(parent_directory.scan())
+    return iter(parent_directory.items())
+
+class DirectoryTree(Mapping):
+    """
+    Read-only view of a real directory in the same nested-dict shape:
+    files map to None and subdirectories to another DirectoryTree.
+    Entries are read with os.scandir only when a directory is visited.
+    Symlinked directories are treated as files so cycles cannot occur.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def scan(self):
+        """
+        Read this directory's (name, value) pairs in one os.scandir call.
+        The handle is closed before returning, so a walk holds no open
+        handles for the directories on its stack.
+        """
+        with os.scandir(self.path) as entries:
+            return [
+                (entry.name, DirectoryTree(entry.path) if entry.is_dir(follow_symlinks=False) else None)
+                for entry in entries
+            ]
+
+    def __iter__(self):
+        return (name for name, _ in self.scan())
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __getitem__(self, name):
+        path = os.path.join(self.path, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            return DirectoryTree(path)
+        if os.path.lexists(path):
+            return None
+        raise KeyError(name)
+
+# Example usage
+print(list(iter_files(directory)) == list_files(directory))  # Output: True
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as root_path:
+        for file_path in list_files(directory):
+            os.makedirs(os.path.join(root_path, os.path.dirname(file_path)), exist_ok=True)
+            open(os.path.join(root_path, file_path), "w").close()
+        tree = DirectoryTree(root_path)
+        print(sorted(iter_files(tree)) == sorted(list_files(directory)))  # Output: True
+        print(len(tree.items()))  # Output: 1
+
+
+# 8. Flattened Nested Sums
+from array import array
+from itertools import accumulate
+
+def flatten_nested_list(lst):
+    """
+    Flatten a nested list once into a contiguous buffer of its integers plus
+    offsets (a ragged layout): sublist i, numbered in pre-order with the root
+    as 0, owns values[starts[i]:ends[i]]. Non-integer leaves are skipped like
+    in sum_nested_list, and integers too large for 64 bits switch the buffer
+    to a plain list. The walk is iterative, so depth is not limited.
+    """
+    values = array("q")
+    starts, ends = array("q", [0]), array("q", [0])
+    stack = [(iter(lst), 0)]
+    while stack:
+        items, index = stack[-1]
+        for item in items:
+            if isinstance(item, int):
+                try:
+                    values.append(item)
+                except OverflowError:
+                    values = list(values)
+                    values.append(item)
+            elif isinstance(item, list):
+                starts.append(len(values))
+                ends.append(0)
+                stack.append((iter(item), len(starts) - 1))
+                break
+        else:
+            ends[index] = len(values)
+            stack.pop()
+    return values, starts, ends
+
+def subtree_sums(values, starts, ends):
+    """Sum of every sublist from one prefix-sum pass over the buffer."""
+    prefix = [0, *accumulate(values)]
+    return [prefix[end] - prefix[start] for start, end in zip(starts, ends)]
+
+# Example usage
+values, starts, ends = flatten_nested_list([1, 2, [3, 4, [5]], "x", [6]])
+print(sum(values))  # Output: 21
+print(subtree_sums(values, starts, ends))  # Output: [21, 12, 5, 6]
+
+def benchmark_nested_sum(width, depth, number=20):
+    """Compare the recursive sum with summing the flattened buffer."""
+    lst = list(range(width))
+    for _ in range(depth):
+        lst = [list(range(width)), lst]
+    values, starts, ends = flatten_nested_list(lst)
+    assert sum(values) == sum_nested_list(lst)
+    recursive = timeit.timeit(lambda: sum_nested_list(lst), number=number) / number
+    flatten = timeit.timeit(lambda: flatten_nested_list(lst), number=number) / number
+    flat = timeit.timeit(lambda: sum(values), number=number) / number
+    print(f"recursive: {recursive:.4f}s, flatten once: {flatten:.4f}s, sum of flat buffer: {flat:.4f}s")
+
+if __name__ == "__main__":
+    benchmark_nested_sum(width=1_000, depth=200)
+
+
+# 9. Product-Tree Factorial
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+def product_range(low, high):
+    """
+    Multiply the integers in [low, high) by binary splitting.
+    Base Case: short ranges are multiplied directly with math.prod.
+    Recursive Case: multiply the products of the two halves, so large
+    multiplications happen between numbers of similar size.
+    """
+    if high - low <= 32:  # Base case
+        return math.prod(range(low, high))
+    middle = (low + high) // 2
+    return product_range(low, middle) * product_range(middle, high)  # Recursive case
+
+def factorial_service(checkpoint_every=1_000, max_checkpoints=32, workers=None, parallel_threshold=200_000):
+    """
+    Return a factorial function with a sparse checkpoint cache: only k! for
+    multiples of checkpoint_every are kept (at most max_checkpoints), and n!
+    is the nearest lower checkpoint times the product of the remaining range.
+    With workers set, ranges longer than parallel_threshold are split into
+    chunks whose products are computed across a process pool.
+    """
+    checkpoints = {0: 1}
+
+    def range_product(low, high):
+        if not workers or high - low < parallel_threshold:
+            return product_range(low, high)
+        step = math.ceil((high - low) / workers)
+        lows = range(low, high, step)
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(product_range, lows, [min(start + step, high) for start in lows]))
+        while len(parts) > 1:  # Combine the chunk products as a tree too
+            parts = [math.prod(parts[i:i + 2]) for i in range(0, len(parts), 2)]
+        return parts[0]
+
+    def factorial(n):
+        if n < 0:
+            raise ValueError("factorial is not defined for negative numbers")
+        base = max(k for k in checkpoints if k <= n)
+        result = checkpoints[base]
+        target = n - n % checkpoint_every
+        if target > base and len(checkpoints) < max_checkpoints:
+            result *= range_product(base + 1, target + 1)
+            checkpoints[target] = result
+            base = target
+        return result * range_product(base + 1, n + 1)
+
+    return factorial
+
+def benchmark_factorial(sizes):
+    """Compare one-by-one multiplication with the product-tree service."""
+    factorial = factorial_service()
+    for n in sizes:
+        start = time.perf_counter()
+        expected = 1
+        for i in range(1, n + 1):
+            expected *= i
+        naive = time.perf_counter() - start
+        start = time.perf_counter()
+        assert factorial(n) == expected
+        tree = time.perf_counter() - start
+        print(f"n={n:>7,}: one by one {naive:.3f}s, product tree {tree:.3f}s")
+
+# Example usage
+factorial = factorial_service()
+print(factorial(5))  # Output: 120
+
+if __name__ == "__main__":  # Process pools need the main-module guard
+    benchmark_factorial([1_000, 10_000, 100_000])
+    parallel_factorial = factorial_service(workers=4, parallel_threshold=50_000)
+    print(parallel_factorial(100_000) == math.factorial(100_000))  # Output: True
@@ -131,3 +131,305 @@ filter_cmd = get_filter_cmd(filters)
 # Test the filter command with the capitalize option
 content = "this is a test. hello world."
 print(filter_cmd(content, ["--capitalize"], []))  # Expected output: This is a test. Hello world.
+
+
+# --- 5. Single-Pass Word Rewriter ---
+
+import re
+from functools import lru_cache
+
+# True if the two strings could overlap when both occur in the same text
+def overlaps(a, b):
+    if a in b or b in a:
+        return True
+    return any(a.endswith(b[:k]) for k in range(1, len(b))) or any(
+        b.endswith(a[:k]) for k in range(1, len(a))
+    )
+
+# Drop pairs that can never match: once `old` has been rewritten to something
+# that cannot recreate it, a later pair with the same `old` finds nothing.
+def drop_shadowed_pairs(word_pairs):
+    kept = []
+    for old, new in word_pairs:
+        earlier = [i for i, (prev_old, _) in enumerate(kept) if prev_old == old]
+        if earlier and all(prev_new and not overlaps(prev_new, old) for _, prev_new in kept[earlier[-1]:]):
+            continue
+        kept.append((old, new))
+    return kept
+
+# Sequential str.replace calls can be fused into one scan only when no match
+# can overlap another and no replacement can create a match for a later pair
+def can_fuse(word_pairs):
+    for i, (old_i, new_i) in enumerate(word_pairs):
+        if not old_i:
+            return False
+        for j, (old_j, _) in enumerate(word_pairs):
+            if i != j and overlaps(old_i, old_j):
+                return False
+            if i < j and (not new_i or overlaps(new_i, old_j)):
+                return False
+    return True
+
+# Below this many pairs the C-level str.replace scans beat one regex pass
+# that calls back into Python for every match
+FUSE_MIN_PAIRS = 50
+
+# Compile word pairs once into a single rewrite function (cached per pair set).
+# The result always equals applying the pairs one after another with str.replace.
+@lru_cache(maxsize=256)
+def compile_rewriter(word_pairs):
+    word_pairs = drop_shadowed_pairs(word_pairs)
+    if len(word_pairs) < FUSE_MIN_PAIRS or not can_fuse(word_pairs):
+        def sequential_rewrite(content):
+            for old, new in word_pairs:
+                content = content.replace(old, new)
+            return content
+        return sequential_rewrite
+
+    table = dict(word_pairs)
+    pattern = fused_pattern(tuple(table))
+    return lambda content: pattern.sub(lambda match: table[match.group()], content)
+
+# One regex alternation matching any of the words, longest first
+@lru_cache(maxsize=256)
+def fused_pattern(words):
+    return re.compile("|".join(map(re.escape, sorted(words, key=len, reverse=True))))
+
+# Filter functions rewritten to use the compiled single-pass rewriter
+def replace_words(content, word_pairs):
+    return compile_rewriter(tuple((old, new) for old, new in word_pairs))(content)
+
+def remove_words(content, word_pairs):
+    return compile_rewriter(tuple((old, "") for old, _ in word_pairs))(content)
+
+def uppercase_words(content, word_pairs):
+    return compile_rewriter(tuple((old, old.upper()) for old, _ in word_pairs))(content)
+
+filters = {
+    "--replace": replace_words,
+    "--remove": remove_words,
+    "--capitalize": capitalize_sentences,
+    "--uppercase": uppercase_words,
+}
+filter_cmd = get_filter_cmd(filters)
+
+# Test the single-pass filters
+word_pairs = [("bad", "good"), ("ugly", "pretty")]
+print(filter_cmd("the bad and the ugly", ["--replace"], word_pairs))  # Expected output: the good and the pretty
+print(filter_cmd("the bad and the ugly", ["--uppercase"], word_pairs))  # Expected output: the BAD and the UGLY
+
+
+# --- 6. Fused Filter Pipelines ---
+
+# Filters that are pure word rewrites, described by the word pairs they apply
+rewrite_rules = {
+    replace_words: lambda word_pairs: [(old, new) for old, new in word_pairs],
+    remove_words: lambda word_pairs: [(old, "") for old, _ in word_pairs],
+    uppercase_words: lambda word_pairs: [(old, old.upper()) for old, _ in word_pairs],
+}
+
+# Validate the options once and merge adjacent rewrite filters into one stage
+def plan_filters(filters, options, word_pairs):
+    if not options:
+        raise Exception("missing options")
+    if any(option not in filters for option in options):
+        raise Exception("invalid option")
+
+    stages = []
+    for option in options:
+        filter_func = filters[option]
+        if filter_func in rewrite_rules:
+            pairs = tuple(rewrite_rules[filter_func](word_pairs))
+            if stages and stages[-1][0] is None:
+                stages[-1] = (None, stages[-1][1] + pairs)
+            else:
+                stages.append((None, pairs))
+        else:
+            stages.append((filter_func, None))
+    return stages
+
+# Compile an option chain into a reusable function of the content
+def compile_filter_cmd(filters, options, word_pairs):
+    steps = [
+        compile_rewriter(pairs) if filter_func is None else lambda content, f=filter_func: f(content, word_pairs)
+        for filter_func, pairs in plan_filters(filters, options, word_pairs)
+    ]
+    def pipeline(content):
+        for step in steps:
+            content = step(content)
+        return content
+    return pipeline
+
+# Streaming rewrite: a match may straddle two chunks, so the last
+# (longest word - 1) characters are held back until the next chunk arrives
+def stream_rewrite(chunks, word_pairs):
+    if any(not old for old, _ in word_pairs):
+        raise Exception("empty words cannot be streamed")
+    word_pairs = drop_shadowed_pairs(word_pairs)
+    if not word_pairs:  # Nothing to replace
+        yield from chunks
+        return
+    if not can_fuse(word_pairs):
+        # Keep the sequential semantics by chaining one streaming pass per pair
+        for pair in word_pairs:
+            chunks = stream_rewrite(chunks, (pair,))
+        yield from chunks
+        return
+
+    table = dict(word_pairs)
+    pattern = fused_pattern(tuple(table))
+    hold = max(map(len, table)) - 1
+    carry = ""
+    for chunk in chunks:
+        buffer = carry + chunk
+        safe = len(buffer) - hold  # every match starting before here is complete
+        output, last = [], 0
+        for match in pattern.finditer(buffer):
+            if match.start() >= safe:
+                break
+            output.append(buffer[last:match.start()])
+            output.append(table[match.group()])
+            last = match.end()
+        cut = max(safe, last)
+        output.append(buffer[last:cut])
+        carry = buffer[cut:]
+        yield "".join(output)
+    yield pattern.sub(lambda match: table[match.group()], carry)
+
+# Streaming capitalize_sentences: only a piece that starts a sentence gets
+# capitalized, continuations of a sentence from the previous chunk are lowercased
+def stream_capitalize(chunks):
+    at_sentence_start = True
+    carry = ""
+    for chunk in chunks:
+        buffer = carry + chunk
+        cut = buffer.rfind(". ")
+        if cut != -1:
+            cut += 2
+        else:
+            # Hold back a trailing "." in case the next chunk starts with " "
+            cut = len(buffer) - 1 if buffer.endswith(".") else len(buffer)
+        head, carry = buffer[:cut], buffer[cut:]
+        if not head:
+            continue
+        pieces = head.split(". ")
+        first = pieces[0].capitalize() if at_sentence_start else pieces[0].lower()
+        yield ". ".join([first] + list(map(str.capitalize, pieces[1:])))
+        at_sentence_start = head.endswith(". ")
+    if carry:
+        yield carry.capitalize() if at_sentence_start else carry.lower()
+
+stream_filters = {capitalize_sentences: stream_capitalize}
+
+# Compile an option chain into a function from input chunks to output chunks
+def compile_filter_stream(filters, options, word_pairs):
+    stages = plan_filters(filters, options, word_pairs)
+    if any(filter_func is not None and filter_func not in stream_filters for filter_func, _ in stages):
+        raise Exception("option cannot be streamed")
+    def pipeline(chunks):
+        for filter_func, pairs in stages:
+            chunks = stream_rewrite(chunks, pairs) if filter_func is None else stream_filters[filter_func](chunks)
+        return chunks
+    return pipeline
+
+# Test the compiled and streaming pipelines
+options = ["--replace", "--uppercase", "--capitalize"]
+word_pairs = [("bad", "good"), ("ugly", "pretty")]
+pipeline = compile_filter_cmd(filters, options, word_pairs)
+print(pipeline("the bad. the ugly."))  # Expected output: The good. The pretty.
+
+stream = compile_filter_stream(filters, options, word_pairs)
+chunks = ["the ba", "d. the ug", "ly."]
+print("".join(stream(chunks)))  # Expected output: The good. The pretty.
+
+
+# --- 7. Batched Background Logger ---
+
+import atexit
+import queue
+import sys
+import threading
+
+# Higher-order function returning a logger that only enqueues (first, second)
+# records. A background thread formats them with `formatter` and writes up to
+# `batch_size` lines per write call, to the current sys.stdout unless `write`
+# is given. When the bounded queue is full, the "block" policy waits for space
+# and the "drop" policy discards the record. A record whose formatting fails,
+# or a batch whose writing fails, is lost, but the thread carries on.
+# shutdown() writes everything still queued, stops the thread and returns the
+# number of records that were never written (dropped or lost); it also runs
+# automatically at interpreter exit. Logging after shutdown raises.
+def get_batched_logger(formatter, write=None, batch_size=256, max_queue=10_000, policy="block"):
+    if policy not in ("block", "drop"):
+        raise Exception("invalid policy")
+    records = queue.Queue(maxsize=max_queue)
+    stop = object()
+    stopped = False
+    dropped = 0
+    lost = 0
+
+    def writer():
+        nonlocal lost
+        while True:
+            batch = [records.get()]
+            while len(batch) < batch_size:
+                try:
+                    batch.append(records.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for record in batch:
+                if record is stop:
+                    continue
+                try:
+                    lines.append(formatter(*record))
+                except Exception as error:
+                    lost += 1
+                    print(f"batched logger lost a record: {error!r}", file=sys.stderr)
+            try:
+                if lines:
+                    (write or sys.stdout.write)("\n".join(lines) + "\n")
+            except Exception as error:
+                lost += len(lines)
+                print(f"batched logger lost {len(lines)} records: {error!r}", file=sys.stderr)
+            if stop in batch:
+                return
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+
+    def logger(first, second):
+        nonlocal dropped
+        if stopped:
+            raise Exception("logger is shut down")
+        if policy == "block":
+            records.put((first, second))
+            return
+        try:
+            records.put_nowait((first, second))
+        except queue.Full:
+            dropped += 1
+
+    def shutdown():
+        nonlocal stopped, dropped
+        if not stopped:
+            stopped = True
+            records.put(stop)
+            thread.join()
+            # Records enqueued by calls that raced with shutdown are never written
+            while True:
+                try:
+                    records.get_nowait()
+                except queue.Empty:
+                    break
+                dropped += 1
+        return dropped + lost
+
+    atexit.register(shutdown)
+    return logger, shutdown
+
+# Log the database errors through the batched logger
+logger, shutdown = get_batched_logger(colon_delimit)
+for err in db_errors:
+    logger("Doc2Doc FATAL", err)
+print(shutdown())  # Expected output: the four error lines, then 0 (nothing dropped or lost)
@@ -96,6 +96,54 @@ print(tag_pre("<div>Sample & text</div>"))
 
 
 
+import timeit
+
+tag_pre_stacked = tag_pre
+
+# Composing version of replacer: a replacer stacked on another replacer is
+# merged into it at decoration time, leaving a single wrapper that holds every
+# replacement. They still run from the outermost decorator inward, so "&" is
+# escaped before "&lt;" is produced and is never double-escaped.
+def replacer(old, new):
+    def replace(decorated_func):
+        replacements = [(old, new)] + getattr(decorated_func, "replacements", [])
+        target = getattr(decorated_func, "target", decorated_func)
+        def wrapper(text):
+            for old_text, new_text in replacements:
+                text = text.replace(old_text, new_text)
+            return target(text)
+        wrapper.replacements = replacements
+        wrapper.target = target
+        return wrapper
+    return replace
+
+@replacer("&", "&amp;")
+@replacer("<", "&lt;")
+@replacer(">", "&gt;")
+@replacer('"', "&quot;")
+@replacer("'", "&#x27;")
+def tag_pre(text):
+    return text
+
+# Example usage
+print(tag_pre("<div>Sample & text</div>"))  # &lt;div&gt;Sample &amp; text&lt;/div&gt;
+print(len(tag_pre.replacements))  # 5 replacements, 1 wrapper
+
+# Benchmark: stacked wrappers vs. merged wrapper vs. a one-scan translate table
+def benchmark_escape(size_mb):
+    line = "<div class='note'>Sample & \"text\"</div> lorem ipsum dolor sit amet\n"
+    text = line * (size_mb * 1_000_000 // len(line))
+    table = str.maketrans(dict(tag_pre.replacements))
+    assert tag_pre(text) == tag_pre_stacked(text) == text.translate(table)
+    for name, func in [("stacked", tag_pre_stacked), ("merged", tag_pre), ("translate", lambda t: t.translate(table))]:
+        seconds = timeit.timeit(lambda: func(text), number=3) / 3
+        print(f"{name}: {seconds:.3f}s for {size_mb} MB")
+
+if __name__ == "__main__":
+    benchmark_escape(4)
+
+
+
 from functools import lru_cache
 
 # Decorator to cache the results of the factorial function
@@ -128,3 +176,414 @@ def is_palindrome(word):
 # Example usage
 print(is_palindrome("racecar"))  # True
 print(is_palindrome("hello"))    # False
+
+
+
+
+import timeit
+
+# Decorator to run a recursive function on an explicit stack. The function is
+# written as a generator: a recursive call is `result = yield (args...)`, and the
+# trampoline runs it and sends the result back, so depth is not capped by the
+# interpreter recursion limit.
+def trampoline(func):
+    def wrapper(*args):
+        stack = [func(*args)]
+        result = None
+        while stack:
+            try:
+                call_args = stack[-1].send(result)
+            except StopIteration as done:
+                stack.pop()
+                result = done.value
+            else:
+                stack.append(func(*call_args))
+                result = None
+        return result
+    return wrapper
+
+# Trampolined palindrome check. It recurses on indexes instead of word[1:-1]
+# slices, so deep inputs do not copy the word at every level.
+@trampoline
+def is_palindrome_between(word, start, end):
+    if end - start <= 1:
+        return True
+    if word[start] != word[end - 1]:
+        return False
+    return (yield (word, start + 1, end - 1))
+
+def is_palindrome_deep(word):
+    return is_palindrome_between(word, 0, len(word))
+
+# Example usage
+print(is_palindrome_deep("racecar"))  # True
+print(is_palindrome_deep("ab" * 100_000 + "a"))  # True (100,000 levels deep)
+
+# Per-call overhead of the trampoline vs. direct recursion
+if __name__ == "__main__":
+    word = "a" * 400
+    direct = timeit.timeit(lambda: (is_palindrome.cache_clear(), is_palindrome(word)), number=200) / (200 * 200)
+    trampolined = timeit.timeit(lambda: is_palindrome_deep(word), number=200) / (200 * 200)
+    print(f"direct: {direct * 1e9:.0f} ns/call, trampolined: {trampolined * 1e9:.0f} ns/call")
+
+
+
+
+import random
+
+# Linear-time palindrome check: two indexes walk in from both ends, comparing
+# one block at a time, so only two short blocks are copied at once and the
+# check stops at the first mismatching block
+def is_palindrome_linear(word, block=4096):
+    start, end = 0, len(word)
+    while end - start > 1:
+        size = min(block, (end - start) // 2)
+        if word[start:start + size] != word[end - size:end][::-1]:
+            return False
+        start += size
+        end -= size
+    return True
+
+# Cache with capped memory: at most 100,000 entries of words up to 64 characters
+MAX_CACHED_LENGTH = 64
+
+@lru_cache(maxsize=100_000)
+def is_palindrome_cached(word):
+    return is_palindrome_linear(word)
+
+# Batch API: check many words in one call, caching only short words
+def check_palindromes(words):
+    return [
+        is_palindrome_cached(word) if len(word) <= MAX_CACHED_LENGTH else is_palindrome_linear(word)
+        for word in words
+    ]
+
+# Example usage
+print(check_palindromes(["racecar", "hello", "a" * 1_000_001]))  # [True, False, True]
+
+# Benchmark: 1,000,000 words drawn from a small vocabulary, mostly cache hits
+if __name__ == "__main__":
+    vocabulary = ["".join(random.choice("ab") for _ in range(random.randint(1, 12))) for _ in range(5_000)]
+    words = random.choices(vocabulary, k=1_000_000)
+    seconds = timeit.timeit(lambda: check_palindromes(words), number=1)
+    print(f"{len(words):,} words in {seconds:.2f}s")
+    print(is_palindrome_cached.cache_info())  # CacheInfo(hits=..., misses=..., maxsize=100000, currsize=...)
+
+
+
+
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import nullcontext
+from itertools import chain
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize", "bytes", "hit_ratio"])
+
+_KWARGS_MARK = object()
+
+# Caching decorator with a choice of eviction policy:
+#   "lru" evicts the least recently used entry,
+#   "lfu" evicts the least frequently used entry (oldest first among ties),
+#   "ttl" evicts in insertion order, which is also expiry order.
+# Entries expire after `ttl` seconds when it is set. Limits can be given as an
+# entry count (maxsize) and/or in bytes (max_bytes, measured with `sizeof` on
+# the value, the key tuple and every argument in it). The lock only guards the
+# cache itself, never the call.
+def cache(policy="lru", maxsize=128, max_bytes=None, ttl=None, thread_safe=False, sizeof=sys.getsizeof):
+    if policy not in ("lru", "lfu", "ttl"):
+        raise ValueError(f"unknown cache policy: {policy}")
+    if policy == "ttl" and ttl is None:
+        raise ValueError("the ttl policy needs a ttl")
+
+    def decorator(func):
+        entries = OrderedDict()  # key -> (value, size, expires_at)
+        frequencies = {}  # key -> use count (lfu only)
+        buckets = {}  # use count -> keys, oldest first (lfu only)
+        # Non-empty use counts form a linked list in ascending order, starting
+        # after the sentinel 0, so the lowest count is always next_count[0]
+        next_count, previous_count = {0: None}, {}
+        stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+        lock = threading.Lock() if thread_safe else nullcontext()
+
+        def entry_size(key, value):
+            parts = chain.from_iterable(part if isinstance(part, tuple) else (part,) for part in key)
+            return sizeof(key) + sum(map(sizeof, parts)) + sizeof(value)
+
+        def add_to_bucket(key, count, after):
+            # Bucket `count` is linked right after bucket `after` when it is new
+            if count not in buckets:
+                buckets[count] = OrderedDict()
+                following = next_count[after]
+                next_count[after], next_count[count], previous_count[count] = count, following, after
+                if following is not None:
+                    previous_count[following] = count
+            buckets[count][key] = None
+            frequencies[key] = count
+
+        def remove_from_bucket(key, count):
+            del buckets[count][key]
+            if not buckets[count]:
+                del buckets[count]
+                before, following = previous_count.pop(count), next_count.pop(count)
+                next_count[before] = following
+                if following is not None:
+                    previous_count[following] = before
+
+        def remove(key):
+            _, size, _ = entries.pop(key)
+            stats["bytes"] -= size
+            if policy == "lfu":
+                remove_from_bucket(key, frequencies.pop(key))
+
+        def touch(key):
+            if policy == "lru":
+                entries.move_to_end(key)
+            elif policy == "lfu":
+                count = frequencies[key]
+                add_to_bucket(key, count + 1, after=count)
+                remove_from_bucket(key, count)
+
+        def victim():
+            if policy == "lfu":
+                return next(iter(buckets[next_count[0]]))
+            return next(iter(entries))
+
+        def store(key, value):
+            if key in entries:
+                remove(key)
+            size = entry_size(key, value)
+            entries[key] = (value, size, time.monotonic() + ttl if ttl is not None else None)
+            stats["bytes"] += size
+            if policy == "lfu":
+                add_to_bucket(key, 1, after=0)
+            while entries and (
+                (maxsize is not None and len(entries) > maxsize)
+                or (max_bytes is not None and stats["bytes"] > max_bytes)
+            ):
+                remove(victim())
+                stats["evictions"] += 1
+
+        def wrapper(*args, **kwargs):
+            key = args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items())) if kwargs else args
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and (entry[2] is None or entry[2] > time.monotonic()):
+                    stats["hits"] += 1
+                    touch(key)
+                    return entry[0]
+                if entry is not None:  # Expired
+                    remove(key)
+                    stats["evictions"] += 1
+                stats["misses"] += 1
+            value = func(*args, **kwargs)
+            with lock:
+                store(key, value)
+            return value
+
+        def cache_info():
+            with lock:
+                lookups = stats["hits"] + stats["misses"]
+                return CacheInfo(
+                    stats["hits"], stats["misses"], stats["evictions"], maxsize, len(entries), stats["bytes"],
+                    stats["hits"] / lookups if lookups else 0.0,
+                )
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                frequencies.clear()
+                buckets.clear()
+                next_count.clear()
+                next_count[0] = None
+                previous_count.clear()
+                stats.update(hits=0, misses=0, evictions=0, bytes=0)
+
+        # A snapshot is a plain list of (key, value) pairs, oldest first, that
+        # can be pickled and later passed to warm() to pre-fill a fresh cache
+        def snapshot():
+            with lock:
+                return [(key, value) for key, (value, _, _) in entries.items()]
+
+        def warm(pairs):
+            with lock:
+                for key, value in pairs:
+                    store(key, value)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        wrapper.snapshot = snapshot
+        wrapper.warm = warm
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorator
+
+# Factorial and palindrome checks using the configurable cache
+@cache(policy="lru", maxsize=1_000)
+def factorial(n):
+    if n == 0:
+        return 1
+    return n * factorial(n - 1)
+
+@cache(policy="lfu", maxsize=None, max_bytes=10_000_000, thread_safe=True)
+def is_palindrome(word):
+    return is_palindrome_linear(word)
+
+# Example usage
+print(factorial(10))  # 3628800
+print(factorial.cache_info())  # CacheInfo(hits=0, misses=11, evictions=0, maxsize=1000, currsize=11, bytes=..., hit_ratio=0.0)
+print(is_palindrome("racecar"), is_palindrome("racecar"))  # True True
+print(is_palindrome.cache_info().hit_ratio)  # 0.5
+
+saved = factorial.snapshot()
+factorial.cache_clear()
+factorial.warm(saved)
+print(factorial(10), factorial.cache_info().hits)  # 3628800 1
+
+# Benchmark: hit ratio and time of each policy on a skewed workload
+def benchmark_cache_policies(calls=200_000, maxsize=256):
+    keys = [int(random.paretovariate(0.5)) for _ in range(calls)]
+    for policy, options in [("lru", {}), ("lfu", {}), ("ttl", {"ttl": 0.05})]:
+        @cache(policy=policy, maxsize=maxsize, **options)
+        def work(n):
+            return sum(range(n % 1_000))
+        seconds = timeit.timeit(lambda: [work(key) for key in keys], number=1)
+        print(f"{policy}: {seconds:.2f}s, hit ratio {work.cache_info().hit_ratio:.1%}")
+
+if __name__ == "__main__":
+    benchmark_cache_policies()
+
+
+
+
+import io
+import json
+from contextlib import redirect_stdout
+
+# Profiling decorator: a quiet replacement for log_call_count that records call
+# counts, exceptions and latencies instead of printing on every call. Each
+# thread updates its own counters, so the hot path takes no lock; one call in
+# every `sample_every` has its latency kept in a fixed-size ring of `window`
+# samples. metrics() merges every thread's counters into a snapshot dict on
+# demand, and with flush_every set a snapshot is also passed to `sink` every
+# that many seconds, by one thread at a time. A failing sink never reaches the
+# caller; it is counted under "sink_errors" instead.
+def profiled(window=1_000, sample_every=16, flush_every=None, sink=None):
+    sink = sink or (lambda snapshot: print(json.dumps(snapshot)))
+
+    def decorator(func):
+        thread_counters = []  # One [calls, errors, seconds, latencies] list per thread
+        register_lock = threading.Lock()
+        flush_lock = threading.Lock()
+        next_flush = [time.perf_counter() + flush_every if flush_every is not None else float("inf")]
+        sink_errors = [0]
+
+        # A threading.local subclass runs __init__ once in each thread that
+        # touches it, so the counters are registered without a check per call
+        class Local(threading.local):
+            def __init__(self):
+                self.counters = [0, 0, 0.0, []]
+                with register_lock:
+                    thread_counters.append(self.counters)
+
+        local = Local()
+
+        def flush(now):
+            if not flush_lock.acquire(blocking=False):
+                return  # Another thread is already flushing
+            try:
+                if now < next_flush[0]:
+                    return
+                next_flush[0] = now + flush_every
+                try:
+                    sink(metrics())
+                except Exception:
+                    sink_errors[0] += 1
+            finally:
+                flush_lock.release()
+
+        def record(own, seconds):
+            if own[0] % sample_every == 0:
+                latencies = own[3]
+                if len(latencies) < window:
+                    latencies.append(seconds)
+                else:
+                    latencies[own[0] // sample_every % window] = seconds
+            own[0] += 1
+            own[2] += seconds
+
+        def wrapper(*args, **kwargs):
+            own = local.counters
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                end = time.perf_counter()
+                own[1] += 1
+                record(own, end - start)
+                if end >= next_flush[0]:
+                    flush(end)
+                raise
+            end = time.perf_counter()
+            if own[0] % sample_every:  # Unsampled calls only add to the totals
+                own[0] += 1
+                own[2] += end - start
+            else:
+                record(own, end - start)
+            if end >= next_flush[0]:
+                flush(end)
+            return result
+
+        def metrics():
+            with register_lock:
+                snapshot = list(thread_counters)
+            calls = sum(own[0] for own in snapshot)
+            seconds = sum(own[2] for own in snapshot)
+            latencies = sorted(chain.from_iterable(list(own[3]) for own in snapshot))
+            percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0
+            return {
+                "function": func.__qualname__,
+                "calls": calls,
+                "errors": sum(own[1] for own in snapshot),
+                "total_seconds": seconds,
+                "mean_seconds": seconds / calls if calls else 0.0,
+                "p50_seconds": percentile(0.5),
+                "p90_seconds": percentile(0.9),
+                "p99_seconds": percentile(0.99),
+                "sink_errors": sink_errors[0],
+            }
+
+        wrapper.metrics = metrics
+        return wrapper
+    return decorator
+
+@profiled()
+def greet(name):
+    if not name:
+        raise ValueError("missing name")
+    return f"Hello, {name}!"
+
+# Example usage
+greet("Alice")
+greet("Bob")
+try:
+    greet("")
+except ValueError:
+    pass
+snapshot = greet.metrics()
+print(snapshot["calls"], snapshot["errors"])  # 3 1
+print(json.dumps(snapshot)[:40])  # {"function": "greet", "calls": 3, "error
+
+# Benchmark: overhead per call of each decorator around a trivial function
+def benchmark_instrumentation(number=200_000):
+    def plain(x):
+        return x
+    variants = [("bare", plain), ("log_call_count", log_call_count(plain)), ("profiled", profiled()(plain))]
+    for name, func in variants:
+        with redirect_stdout(io.StringIO()):  # Keep log_call_count's prints off the terminal
+            seconds = timeit.timeit(lambda: func(1), number=number)
+        print(f"{name}: {seconds / number * 1e9:.0f} ns/call")
+
+if __name__ == "__main__":
+    benchmark_instrumentation()
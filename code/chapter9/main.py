@@ -1,16 +1,83 @@
+import random
+import time
 from enum import Enum
+from itertools import compress
 
 # Sum Types for Document Parsing
+# __slots__ drops the per-instance __dict__, and __match_args__ lets match
+# statements destructure results positionally: case Parsed(name, text)
 class Parsed:
+    __slots__ = ("doc_name", "text")
+    __match_args__ = ("doc_name", "text")
+
     def __init__(self, doc_name, text):
         self.doc_name = doc_name
         self.text = text
 
 class ParseError:
+    __slots__ = ("doc_name", "err")
+    __match_args__ = ("doc_name", "err")
+
     def __init__(self, doc_name, err):
         self.doc_name = doc_name
         self.err = err
 
+# Columnar Batch of Parse Results
+# Stores many results as parallel columns (names, payloads and one ok byte per
+# row) instead of one object per document, so outcomes can be counted and
+# filtered without creating Parsed/ParseError objects. Indexing a row builds
+# the matching object on demand.
+_INVERT_FLAGS = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+class ParseBatch:
+    __slots__ = ("names", "payloads", "ok")
+
+    def __init__(self):
+        self.names = []
+        self.payloads = []
+        self.ok = bytearray()
+
+    def add_parsed(self, doc_name, text):
+        self.names.append(doc_name)
+        self.payloads.append(text)
+        self.ok.append(1)
+
+    def add_error(self, doc_name, err):
+        self.names.append(doc_name)
+        self.payloads.append(err)
+        self.ok.append(0)
+
+    def add(self, result):
+        match result:
+            case Parsed(doc_name, text):
+                self.add_parsed(doc_name, text)
+            case ParseError(doc_name, err):
+                self.add_error(doc_name, err)
+            case _:
+                raise Exception("unknown parse result")
+
+    def __len__(self):
+        return len(self.ok)
+
+    def __getitem__(self, index):
+        if self.ok[index]:
+            return Parsed(self.names[index], self.payloads[index])
+        return ParseError(self.names[index], self.payloads[index])
+
+    def count_parsed(self):
+        return self.ok.count(1)
+
+    def count_errors(self):
+        return len(self.ok) - self.count_parsed()
+
+    def parsed(self):
+        # (doc_name, text) pairs of the successful rows
+        return compress(zip(self.names, self.payloads), self.ok)
+
+    def errors(self):
+        # (doc_name, err) pairs of the failed rows
+        return compress(zip(self.names, self.payloads), self.ok.translate(_INVERT_FLAGS))
+
 # Enum for Document Types
 class DocType(Enum):
     PDF = "PDF"
@@ -53,31 +120,189 @@ class EditType(Enum):
     INSERT = "INSERT"
     DELETE = "DELETE"
 
-# Document Editing Function
-def handle_edit(document, edit_type, edit):
+# Persistent Line-Indexed Document
+# Lines are stored in an implicit treap (a randomized balanced tree ordered by
+# line position). Nodes are never mutated once shared, so every edit copies only
+# the O(log M) nodes on one root-to-leaf path and older versions stay valid.
+class _Line:
+    __slots__ = ("text", "priority", "left", "right", "size")
+
+    def __init__(self, text, priority, left=None, right=None):
+        self.text = text
+        self.priority = priority
+        self.left = left
+        self.right = right
+        self.size = 1 + _size(left) + _size(right)
+
+def _size(node):
+    return node.size if node else 0
+
+def _split(node, count):
+    # Split into (first `count` lines, remaining lines), copying one path
+    if node is None:
+        return None, None
+    left_size = _size(node.left)
+    if count <= left_size:
+        left, right = _split(node.left, count)
+        return left, _Line(node.text, node.priority, right, node.right)
+    left, right = _split(node.right, count - left_size - 1)
+    return _Line(node.text, node.priority, node.left, left), right
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        return _Line(left.text, left.priority, left.left, _merge(left.right, right))
+    return _Line(right.text, right.priority, _merge(left, right.left), right.right)
+
+def _build(lines):
+    # Build a treap from lines in O(M) with the Cartesian-tree stack algorithm.
+    # Nodes are only mutated here, before anything else can reference them.
+    stack = []
+    for text in lines:
+        node = _Line(text, random.random())
+        last = None
+        while stack and stack[-1].priority < node.priority:
+            last = stack.pop()
+        node.left = last
+        if stack:
+            stack[-1].right = node
+        stack.append(node)
+    if not stack:
+        return None
+    # Recompute subtree sizes bottom-up (children are visited before parents)
+    order, pending = [], [stack[0]]
+    while pending:
+        node = pending.pop()
+        order.append(node)
+        pending.extend(child for child in (node.left, node.right) if child)
+    for node in reversed(order):
+        node.size = 1 + _size(node.left) + _size(node.right)
+    return stack[0]
+
+class Document:
+    def __init__(self, root=None):
+        self._root = root
+
+    @classmethod
+    def from_text(cls, text):
+        return cls(_build(text.split('\n')))
+
+    def __len__(self):
+        return _size(self._root)
+
+    def __str__(self):
+        return '\n'.join(self.lines())
+
+    def _index(self, line_number):
+        # Same indexing rules as a list of lines, including negative indexes
+        if line_number < 0:
+            line_number += len(self)
+        if not 0 <= line_number < len(self):
+            raise IndexError("line number out of range")
+        return line_number
+
+    def line(self, line_number):
+        index = self._index(line_number)
+        node = self._root
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.text
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def lines(self):
+        # In-order traversal with an explicit stack
+        stack, node = [], self._root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.text
+            node = node.right
+
+    def replace_line(self, line_number, text):
+        # Returns a new Document; text containing '\n' becomes several lines
+        index = self._index(line_number)
+        left, rest = _split(self._root, index)
+        _, right = _split(rest, 1)
+        return Document(_merge(_merge(left, _build(text.split('\n'))), right))
+
+# Single-Line Edit Function
+def edit_line(line, edit_type, edit):
     match edit_type:
         case EditType.NEWLINE:
-            lines = document.split('\n')
-            lines[edit['line_number']] += '\n'
-            return '\n'.join(lines)
+            return line + '\n'
         case EditType.SUBSTITUTE:
-            lines = document.split('\n')
-            line = lines[edit['line_number']]
-            lines[edit['line_number']] = line[:edit['start']] + edit['insert_text'] + line[edit['end']:]
-            return '\n'.join(lines)
+            return line[:edit['start']] + edit['insert_text'] + line[edit['end']:]
         case EditType.INSERT:
-            lines = document.split('\n')
-            line = lines[edit['line_number']]
-            lines[edit['line_number']] = line[:edit['start']] + edit['insert_text'] + line[edit['start']:]
-            return '\n'.join(lines)
+            return line[:edit['start']] + edit['insert_text'] + line[edit['start']:]
         case EditType.DELETE:
-            lines = document.split('\n')
-            line = lines[edit['line_number']]
-            lines[edit['line_number']] = line[:edit['start']] + line[edit['end']:]
-            return '\n'.join(lines)
+            return line[:edit['start']] + line[edit['end']:]
         case _:
             raise Exception("unknown edit type")
 
+# Document Editing Function
+# Strings are edited by splitting into lines; Documents are edited persistently.
+def handle_edit(document, edit_type, edit):
+    line_number = edit['line_number']
+    if isinstance(document, Document):
+        return document.replace_line(line_number, edit_line(document.line(line_number), edit_type, edit))
+    lines = document.split('\n')
+    lines[line_number] = edit_line(lines[line_number], edit_type, edit)
+    return '\n'.join(lines)
+
+# Batched Edit Replay
+# Consecutive edits to the same line are applied to a plain string and written
+# back once, and the final document is materialised a single time at the end.
+# `edits` can be any iterable (e.g. a generator over an edit log on disk).
+def apply_edits(document, edits):
+    doc = Document.from_text(document) if isinstance(document, str) else document
+    pending_number, pending_line = None, None
+    for edit_type, edit in edits:
+        line_number = doc._index(edit['line_number'])  # Negative numbers become positive once
+        if line_number != pending_number:
+            if pending_number is not None:
+                doc = doc.replace_line(pending_number, pending_line)
+            pending_number, pending_line = line_number, doc.line(line_number)
+        pending_line = edit_line(pending_line, edit_type, edit)
+        # A new line break shifts the numbering of every later line, so flush now
+        if edit_type is EditType.NEWLINE or '\n' in edit.get('insert_text', ''):
+            doc = doc.replace_line(pending_number, pending_line)
+            pending_number = None
+    if pending_number is not None:
+        doc = doc.replace_line(pending_number, pending_line)
+    return str(doc) if isinstance(document, str) else doc
+
+# Benchmark: naive handle_edit loop vs. apply_edits, in edits per second
+def benchmark_apply_edits(num_lines, num_edits):
+    document = '\n'.join(f"Line {i}" for i in range(num_lines))
+    edits = [
+        (EditType.INSERT, {"line_number": random.randrange(num_lines), "insert_text": "!", "start": 0})
+        for _ in range(num_edits)
+    ]
+
+    start = time.perf_counter()
+    naive = document
+    for edit_type, edit in edits:
+        naive = handle_edit(naive, edit_type, edit)
+    naive_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = apply_edits(document, (pair for pair in edits))
+    batched_seconds = time.perf_counter() - start
+
+    assert naive == batched
+    print(f"naive: {num_edits / naive_seconds:,.0f} edits/sec")
+    print(f"apply_edits: {num_edits / batched_seconds:,.0f} edits/sec")
+
 # Example Usage
 if __name__ == "__main__":
     # Parsing Documents
@@ -85,14 +310,24 @@ if __name__ == "__main__":
     error_doc = ParseError("example.txt", "File not found.")
 
     def handle_parsed(doc):
-        if isinstance(doc, Parsed):
-            print(f"Document '{doc.doc_name}' parsed successfully: {doc.text}")
-        elif isinstance(doc, ParseError):
-            print(f"Error parsing '{doc.doc_name}': {doc.err}")
+        match doc:
+            case Parsed(doc_name, text):
+                print(f"Document '{doc_name}' parsed successfully: {text}")
+            case ParseError(doc_name, err):
+                print(f"Error parsing '{doc_name}': {err}")
 
     handle_parsed(parsed_doc)  # Output: Document 'example.txt' parsed successfully: This is a sample document.
     handle_parsed(error_doc)   # Output: Error parsing 'example.txt': File not found.
 
+    # Batched Parse Results
+    batch = ParseBatch()
+    batch.add(parsed_doc)
+    batch.add(error_doc)
+    batch.add_parsed("notes.md", "# Notes")
+    print(batch.count_parsed(), batch.count_errors())  # Output: 2 1
+    print(list(batch.errors()))  # Output: [('example.txt', 'File not found.')]
+    handle_parsed(batch[2])  # Output: Document 'notes.md' parsed successfully: # Notes
+
     # Format Conversion
     content = "# This is a heading"
     converted_content = convert_format(content, DocType.MD, DocType.HTML)
@@ -108,4 +343,20 @@ if __name__ == "__main__":
     document = "Line 1\nLine 2\nLine 3"
     edit = {"line_number": 1, "insert_text": " inserted", "start": 5}
     edited_doc = handle_edit(document, EditType.INSERT, edit)
-    print(edited_doc)  # Output: Line 1\nLine 2 inserted\nLine 3
\ No newline at end of file
+    print(edited_doc)  # Output: Line 1\nLine 2 inserted\nLine 3
+
+    # Persistent Document Editing
+    original = Document.from_text(document)
+    edited = handle_edit(original, EditType.NEWLINE, {"line_number": 0})
+    edited = handle_edit(edited, EditType.SUBSTITUTE, {"line_number": 3, "insert_text": "Three", "start": 5, "end": 6})
+    print(str(edited))    # Output: Line 1\n\nLine 2\nLine Three
+    print(str(original))  # Output: Line 1\nLine 2\nLine 3 (old version is unchanged)
+
+    # Batched Edit Replay
+    edits = [
+        (EditType.INSERT, {"line_number": 2, "insert_text": "!", "start": 6}),
+        (EditType.INSERT, {"line_number": 2, "insert_text": "!", "start": 7}),
+        (EditType.NEWLINE, {"line_number": 0}),
+    ]
+    print(apply_edits(document, iter(edits)))  # Output: Line 1\n\nLine 2\nLine 3!!
+    benchmark_apply_edits(num_lines=20_000, num_edits=2_000)